@@ -23,7 +23,10 @@ export const conversations = sqliteTable(
         updatedAt: text("updated_at").notNull(),
         scrapedAt: text("scraped_at").notNull(),
     },
-    (table) => [index("idx_conversations_inserted_at").on(table.insertedAt)]
+    (table) => [
+        index("idx_conversations_inserted_at").on(table.insertedAt),
+        index("idx_conversations_updated_at").on(table.updatedAt, table.id),
+    ]
 );
 
 // Conversation-Tag junction table
@@ -159,6 +162,19 @@ export const llmAnalysisRuns = sqliteTable("llm_analysis_runs", {
     errorMessage: text("error_message"),
 });
 
+export const exportRuns = sqliteTable("export_runs", {
+    id: integer("id").primaryKey({ autoIncrement: true }),
+    startedAt: text("started_at").notNull(),
+    completedAt: text("completed_at"),
+    status: text("status").notNull(), // running, completed, cancelled, failed
+    fromDate: text("from_date"),
+    toDate: text("to_date"),
+    since: text("since"), // watermark this export resumed from
+    watermark: text("watermark"), // UTC start time; next incremental export takes rows scraped/analyzed after it
+    conversationsExported: integer("conversations_exported").default(0),
+    errorMessage: text("error_message"),
+});
+
 // ==================== RELATIONS ====================
 
 export const conversationsRelations = relations(conversations, ({ many, one }) => ({
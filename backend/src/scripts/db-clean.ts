@@ -15,6 +15,7 @@ const beforeCounts = {
     scraperRuns: (sqlite.query("SELECT COUNT(*) as count FROM scraper_runs").get() as any).count,
     llmAnalysisRuns: (sqlite.query("SELECT COUNT(*) as count FROM llm_analysis_runs").get() as any)
         .count,
+    exportRuns: (sqlite.query("SELECT COUNT(*) as count FROM export_runs").get() as any).count,
 };
 
 console.log("Before cleaning:");
@@ -27,6 +28,7 @@ console.log(`  Tickets: ${beforeCounts.tickets}`);
 console.log(`  Risk Flags: ${beforeCounts.riskFlags}`);
 console.log(`  Scraper Runs: ${beforeCounts.scraperRuns}`);
 console.log(`  LLM Analysis Runs: ${beforeCounts.llmAnalysisRuns}`);
+console.log(`  Export Runs: ${beforeCounts.exportRuns}`);
 
 // Clean all tables (order matters due to foreign keys)
 console.log("\n🗑️  Deleting all data...");
@@ -41,6 +43,7 @@ sqlite.exec("DELETE FROM tags");
 sqlite.exec("DELETE FROM staff");
 sqlite.exec("DELETE FROM llm_analysis_runs");
 sqlite.exec("DELETE FROM scraper_runs");
+sqlite.exec("DELETE FROM export_runs");
 
 // Reset auto-increment counters
 sqlite.exec("DELETE FROM sqlite_sequence");
@@ -0,0 +1,178 @@
+"""
+Record/replay fixtures for LLM analysis
+Captures real prompt/response pairs, anonymized, so the parse/validate/save
+pipeline can be replayed and benchmarked without calling Vertex AI
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+# Default fixture corpus location
+DEFAULT_FIXTURE_DIR = Path(__file__).parent / "fixtures" / "llm"
+
+FIXTURE_VERSION = 1
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+# Vietnamese phone numbers, with or without space/dot/dash separators
+PHONE_RE = re.compile(r"(?<![\w+])(?:\+84|84|0)(?:[ .\-]?\d){8,10}(?!\d)")
+# CCCD and other long digit runs
+DIGITS_RE = re.compile(r"\d{6,}")
+UNICODE_ESCAPE_RE = re.compile(r"\\u([0-9a-fA-F]{4})")
+
+
+class Anonymizer:
+    """Replaces IDs, names and contact details with stable placeholders"""
+
+    def __init__(self):
+        self.ids: dict[str, str] = {}
+        self.names: dict[str, str] = {}
+        self.counters: dict[str, int] = {}
+
+    def add_id(self, real_id: str, prefix: str) -> str:
+        if real_id not in self.ids:
+            self.counters[prefix] = self.counters.get(prefix, 0) + 1
+            self.ids[real_id] = f"{prefix}_{self.counters[prefix]}"
+        return self.ids[real_id]
+
+    def add_name(self, name: str | None, placeholder: str):
+        if name and len(name.strip()) > 1 and name not in self.names:
+            self.names[name] = placeholder
+
+    def id(self, value):
+        return self.ids.get(value, value)
+
+    def text(self, value):
+        if not value:
+            return value
+        # Replace longer names first so "Nguyen Van A" wins over "Nguyen",
+        # and only whole words so "Lan" doesn't touch "Lancome"
+        for name in sorted(self.names, key=len, reverse=True):
+            value = re.sub(
+                rf"(?<!\w){re.escape(name)}(?!\w)", self.names[name], value)
+        value = EMAIL_RE.sub("<email>", value)
+        value = PHONE_RE.sub("<phone>", value)
+        return DIGITS_RE.sub(lambda m: "#" * len(m.group()), value)
+
+    def json_text(self, value: str) -> str:
+        """Anonymize a JSON document's strings, keeping it valid JSON
+
+        Works on the decoded values so \\uXXXX-escaped names are caught too.
+        Unparseable (e.g. truncated) text has its escapes decoded and is
+        anonymized as plain text.
+        """
+        try:
+            data = json.loads(value)
+        except json.JSONDecodeError:
+            decoded = UNICODE_ESCAPE_RE.sub(
+                lambda m: chr(int(m.group(1), 16)), value)
+            return self.text(decoded)
+        return json.dumps(self.walk(data), ensure_ascii=False)
+
+    def walk(self, value):
+        if isinstance(value, str):
+            return self.text(value)
+        if isinstance(value, list):
+            return [self.walk(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.walk(item) for key, item in value.items()}
+        return value
+
+
+def anonymize_exchange(
+    data: dict, prompt: str, response_text: str, result: dict, saved: dict
+) -> dict:
+    """Build an anonymized fixture from one analysis exchange"""
+    conversation = data["conversation"]
+    customer = data.get("customer") or {}
+    anon = Anonymizer()
+
+    anon.add_id(conversation["id"], "conv")
+    for msg in data["messages"]:
+        anon.add_id(msg["id"], "m")
+
+    for name in (customer.get("name"), conversation.get("customer_name")):
+        anon.add_name(name, "Customer")
+        # Staff usually address customers by given name ("chị Mai")
+        if name and " " in name.strip():
+            anon.add_name(name.split()[-1], "Customer")
+    anon.add_name(result.get("staff_name"), "Staff")
+    for i, tag in enumerate(data.get("tags", [])):
+        anon.add_name(tag.get("name"), f"Tag {i + 1}")
+
+    expected = {
+        "tickets": [
+            {
+                **ticket,
+                "start_message_id": anon.id(ticket.get("start_message_id")),
+                "end_message_id": anon.id(ticket.get("end_message_id")),
+                "outcome": anon.text(ticket.get("outcome")),
+            }
+            for ticket in result.get("tickets", [])
+        ],
+        "auto_reply_message_ids": [
+            anon.id(mid) for mid in result.get("auto_reply_message_ids", [])
+        ],
+        "risk_flags": [
+            {**flag, "message_id": anon.id(flag.get("message_id"))}
+            for flag in result.get("risk_flags", [])
+        ],
+        "staff_name": anon.text(result.get("staff_name")),
+        "conversation_id": anon.id(result.get("conversation_id")),
+    }
+
+    return {
+        "version": FIXTURE_VERSION,
+        "conversation_id": anon.id(conversation["id"]),
+        "messages": [
+            {
+                "id": anon.id(msg["id"]),
+                "inserted_at": msg.get("inserted_at", ""),
+                "content": anon.text(msg.get("content", "")),
+                "is_auto_reply": msg.get("is_auto_reply") or 0,
+            }
+            for msg in data["messages"]
+        ],
+        "prompt": anon.text(prompt),
+        "response_text": anon.json_text(response_text),
+        "expected": expected,
+        "expected_saved": saved,
+    }
+
+
+def record_llm_exchange(
+    record_dir: str | Path,
+    data: dict,
+    prompt: str,
+    response_text: str,
+    result: dict,
+    saved: dict,
+    model_name: str,
+) -> Path:
+    """Write an anonymized prompt/response fixture to record_dir
+
+    `saved` holds the tickets_created/risk_flags_created counts returned by
+    save_analysis_result for this result.
+    """
+    record_dir = Path(record_dir)
+    record_dir.mkdir(parents=True, exist_ok=True)
+
+    fixture = anonymize_exchange(data, prompt, response_text, result, saved)
+    now = datetime.now()
+    fixture["recorded_at"] = now.isoformat()
+    fixture["model"] = model_name
+
+    path = record_dir / f"{now.strftime('%Y%m%d_%H%M%S_%f')}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_fixtures(fixture_dir: str | Path = DEFAULT_FIXTURE_DIR) -> list[tuple[Path, dict]]:
+    """Load all fixtures in fixture_dir, sorted by file name"""
+    fixtures = []
+    for path in sorted(Path(fixture_dir).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            fixtures.append((path, json.load(f)))
+    return fixtures
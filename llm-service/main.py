@@ -6,27 +6,31 @@ Simplified version: sentiment detection, risk flag identification, ticket creati
 
 import os
 import json
+import base64
+import hashlib
 import sqlite3
 import re
 import signal
 import sys
-from datetime import datetime
+import threading
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-import vertexai
-from vertexai.generative_models import GenerativeModel, GenerationConfig
+from llm_fixtures import record_llm_exchange
 
 # Load environment variables from parent .env file
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
-# Initialize Vertex AI
+# Vertex AI settings (the SDK itself is imported lazily, see get_model)
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv(
     "GOOGLE_APPLICATION_CREDENTIALS", "sa.json")
 GOOGLE_CLOUD_REGION = os.getenv("GOOGLE_CLOUD_REGION", "us-central1")
@@ -40,7 +44,81 @@ if sa_path.exists():
 # Database path
 DB_PATH = Path(__file__).parent.parent / "backend" / "customer_service_qa.db"
 
-app = FastAPI(title="Customer Service QA LLM Service")
+# Directory to record anonymized prompt/response fixtures into (disabled if unset)
+LLM_RECORD_DIR = os.getenv("LLM_RECORD_DIR")
+
+# Default/maximum page size for paginated conversation messages
+MESSAGE_PAGE_SIZE = 50
+MAX_MESSAGE_PAGE_SIZE = 500
+
+
+
+def positive_int(value: str, name: str = "value") -> int:
+    """Parse a strictly positive integer setting (also an argparse type)"""
+    number = int(value)
+    if number <= 0:
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+    return number
+
+
+# Conversations fetched per export chunk (bounds export memory)
+EXPORT_CHUNK_SIZE = positive_int(
+    os.getenv("EXPORT_CHUNK_SIZE", "200"), "EXPORT_CHUNK_SIZE")
+
+# Gemini model client, created on first use or by the startup warm-up
+_model = None
+_model_error: Optional[str] = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Get the Gemini model, importing and initializing Vertex AI on first use
+
+    The google-cloud-aiplatform stack takes seconds to import, so it is kept
+    out of module import to let uvicorn bind the port immediately.
+    """
+    global _model, _model_error
+
+    with _model_lock:
+        if _model is None:
+            try:
+                import vertexai
+                from vertexai.generative_models import GenerativeModel
+
+                project_id = None
+                if sa_path.exists():
+                    with open(sa_path) as f:
+                        sa_data = json.load(f)
+                        project_id = sa_data.get("project_id")
+
+                if project_id:
+                    vertexai.init(project=project_id,
+                                  location=GOOGLE_CLOUD_REGION)
+
+                _model = GenerativeModel(MODEL_NAME)
+                _model_error = None
+            except Exception as e:
+                _model_error = str(e)
+                raise
+        return _model
+
+
+def warm_up_model():
+    """Load the model client in the background so the first analysis is fast"""
+    try:
+        get_model()
+        print(f"🤖 Model client ready ({MODEL_NAME})")
+    except Exception as e:
+        print(f"⚠️ Model client warm-up failed: {str(e)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    threading.Thread(target=warm_up_model, daemon=True).start()
+    yield
+
+
+app = FastAPI(title="Customer Service QA LLM Service", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -266,6 +344,172 @@ def get_conversation_data(conversation_id: str) -> Optional[dict]:
         conn.close()
 
 
+def get_conversation_version(cursor, conversation_id: str) -> Optional[str]:
+    """Get a version fingerprint that changes on new messages or analysis
+
+    Derived from per-conversation aggregates rather than stored, since the
+    scraper rewrites conversation rows with INSERT OR REPLACE.
+    """
+    cursor.execute(
+        """SELECT c.updated_at,
+            (SELECT COUNT(*) || ':' || IFNULL(MAX(inserted_at), '') || ':' ||
+                    IFNULL(SUM(is_auto_reply), 0) || ':' || IFNULL(SUM(has_risk_flag), 0)
+                FROM messages WHERE conversation_id = c.id),
+            (SELECT COUNT(*) || ':' || IFNULL(MAX(id), 0) || ':' || IFNULL(MAX(analyzed_at), '')
+                FROM tickets WHERE conversation_id = c.id),
+            (SELECT COUNT(*) || ':' || IFNULL(MAX(rf.id), 0)
+                FROM risk_flags rf JOIN messages m ON m.id = rf.message_id
+                WHERE m.conversation_id = c.id)
+        FROM conversations c WHERE c.id = ?""",
+        (conversation_id,),
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None
+    fingerprint = "|".join(str(value) for value in row)
+    return hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+
+
+def encode_message_cursor(inserted_at: str, message_id: str) -> str:
+    """Encode a (inserted_at, id) position as an opaque cursor"""
+    raw = json.dumps([inserted_at, message_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_message_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from encode_message_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not (
+        isinstance(value, list)
+        and len(value) == 2
+        and all(isinstance(item, str) for item in value)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value[0], value[1]
+
+
+def message_page_etag(version: str, cursor: Optional[str], limit: int) -> str:
+    """Build the ETag for one page of a conversation at a given version"""
+    digest = hashlib.sha1(f"{version}:{cursor or ''}:{limit}".encode())
+    return f'"{digest.hexdigest()[:16]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def get_conversation_messages_page(
+    db_cursor, conversation_id: str, version: str, cursor: Optional[str], limit: int
+) -> dict:
+    """Get one page of messages with their ticket and risk flag annotations
+
+    `db_cursor` must use sqlite3.Row; `version` is the conversation version
+    already read in the same transaction.
+    """
+    db_cursor.execute(
+        "SELECT id, customer_name, updated_at FROM conversations WHERE id = ?",
+        (conversation_id,),
+    )
+    conversation = dict(db_cursor.fetchone())
+
+    params = [conversation_id]
+    after = ""
+    if cursor:
+        inserted_at, message_id = decode_message_cursor(cursor)
+        after = "AND (inserted_at > ? OR (inserted_at = ? AND id > ?))"
+        params.extend([inserted_at, inserted_at, message_id])
+
+    # Fetch one extra row to know whether there is a next page
+    db_cursor.execute(
+        f"""SELECT id, sender_id, inserted_at, content, is_auto_reply
+        FROM messages
+        WHERE conversation_id = ? {after}
+        ORDER BY inserted_at ASC, id ASC
+        LIMIT ?""",
+        (*params, limit + 1),
+    )
+    rows = db_cursor.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Ticket ranges by time of their start/end messages
+    db_cursor.execute(
+        """SELECT t.id, t.sentiment, t.outcome, t.staff_attitude,
+            t.staff_quality, t.is_resolved,
+            ms.inserted_at AS range_start, me.inserted_at AS range_end
+        FROM tickets t
+        JOIN messages ms ON ms.id = t.start_message_id
+        JOIN messages me ON me.id = t.end_message_id
+        WHERE t.conversation_id = ?
+        ORDER BY ms.inserted_at ASC""",
+        (conversation_id,),
+    )
+    ticket_rows = [dict(row) for row in db_cursor.fetchall()]
+
+    risk_types: dict[str, list[str]] = {}
+    if rows:
+        placeholders = ",".join("?" * len(rows))
+        db_cursor.execute(
+            f"""SELECT message_id, risk_type FROM risk_flags
+            WHERE message_id IN ({placeholders})""",
+            [row["id"] for row in rows],
+        )
+        for message_id, risk_type in db_cursor.fetchall():
+            risk_types.setdefault(message_id, []).append(risk_type)
+
+    messages = []
+    tickets = {}
+    for row in rows:
+        ticket = next(
+            (t for t in ticket_rows
+             if t["range_start"] <= row["inserted_at"] <= t["range_end"]),
+            None,
+        )
+        if ticket:
+            tickets[ticket["id"]] = {
+                "id": ticket["id"],
+                "sentiment": ticket["sentiment"],
+                "outcome": ticket["outcome"],
+                "staff_attitude": ticket["staff_attitude"],
+                "staff_quality": ticket["staff_quality"],
+                "is_resolved": bool(ticket["is_resolved"]),
+            }
+        messages.append({
+            "id": row["id"],
+            "sender_id": row["sender_id"],
+            "inserted_at": row["inserted_at"],
+            "content": row["content"],
+            "is_auto_reply": bool(row["is_auto_reply"]),
+            "ticket_id": ticket["id"] if ticket else None,
+            "risk_types": risk_types.get(row["id"], []),
+        })
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_message_cursor(
+            rows[-1]["inserted_at"], rows[-1]["id"])
+
+    return {
+        "conversation": conversation,
+        "version": version,
+        "messages": messages,
+        "tickets": list(tickets.values()),
+        "next_cursor": next_cursor,
+    }
+
+
 def format_messages_for_prompt(messages: list[dict]) -> tuple[str, dict]:
     """Format messages for LLM prompt with short IDs
 
@@ -288,8 +532,12 @@ def format_messages_for_prompt(messages: list[dict]) -> tuple[str, dict]:
     return "\n".join(formatted), id_mapping
 
 
-def analyze_conversation_with_llm(data: dict) -> dict:
-    """Analyze conversation using Vertex AI Gemini"""
+def build_analysis_prompt(data: dict) -> tuple[str, dict]:
+    """Build the analysis prompt for a conversation
+
+    Returns:
+        tuple: (prompt, id_mapping) where id_mapping maps short_id -> real_id
+    """
     conversation = data["conversation"]
     messages = data["messages"]
     tags = data.get("tags", [])
@@ -306,19 +554,13 @@ def analyze_conversation_with_llm(data: dict) -> dict:
         customer_tags=", ".join(tag_texts) if tag_texts else "None",
         messages=formatted_messages,
     )
+    return prompt, id_mapping
 
-    # Initialize Vertex AI model
-    project_id = None
-    sa_path = Path(__file__).parent.parent / GOOGLE_APPLICATION_CREDENTIALS
-    if sa_path.exists():
-        with open(sa_path) as f:
-            sa_data = json.load(f)
-            project_id = sa_data.get("project_id")
-
-    if project_id:
-        vertexai.init(project=project_id, location=GOOGLE_CLOUD_REGION)
 
-    model = GenerativeModel(MODEL_NAME)
+def generate_analysis_text(prompt: str) -> str:
+    """Send the prompt to Vertex AI Gemini and return the raw response text"""
+    model = get_model()
+    from vertexai.generative_models import GenerationConfig
 
     # Generate response
     generation_config = GenerationConfig(
@@ -329,35 +571,31 @@ def analyze_conversation_with_llm(data: dict) -> dict:
 
     response = model.generate_content(
         prompt, generation_config=generation_config)
+    return response.text
 
-    # Parse JSON response using Pydantic for validation
+
+def extract_analysis_json(text: str) -> dict:
+    """Parse the LLM response text, falling back to an empty result"""
     try:
         # Try to parse directly
-        result_data = json.loads(response.text)
-    except json.JSONDecodeError as e:
+        return json.loads(text)
+    except json.JSONDecodeError:
         # Try to extract JSON from response
-        json_match = re.search(r"\{[\s\S]*\}", response.text)
+        json_match = re.search(r"\{[\s\S]*\}", text)
         if json_match:
             try:
-                result_data = json.loads(json_match.group())
+                return json.loads(json_match.group())
             except json.JSONDecodeError:
                 # Response is truncated - return empty result
                 print(f"   ⚠️ JSON truncated, returning empty result")
-                result_data = {"tickets": [],
-                               "auto_reply_message_ids": [], "risk_flags": []}
         else:
             # No valid JSON found - return empty result
             print(f"   ⚠️ No valid JSON found, returning empty result")
-            result_data = {"tickets": [],
-                           "auto_reply_message_ids": [], "risk_flags": []}
-
-    # Validate with Pydantic
-    validated_result = LLMAnalysisResult.model_validate(result_data)
+        return {"tickets": [], "auto_reply_message_ids": [], "risk_flags": []}
 
-    # Convert back to dict
-    result = validated_result.model_dump()
 
-    # Map short IDs back to real IDs
+def remap_message_ids(result: dict, id_mapping: dict) -> dict:
+    """Map short IDs (msg_1, msg_2, ...) in a result back to real message IDs"""
     for ticket in result.get("tickets", []):
         if ticket.get("start_message_id") in id_mapping:
             ticket["start_message_id"] = id_mapping[ticket["start_message_id"]]
@@ -372,10 +610,36 @@ def analyze_conversation_with_llm(data: dict) -> dict:
         if flag.get("message_id") in id_mapping:
             flag["message_id"] = id_mapping[flag["message_id"]]
 
-    result["conversation_id"] = conversation["id"]
     return result
 
 
+def parse_analysis_response(text: str, id_mapping: dict, conversation_id: str) -> dict:
+    """Parse, validate and remap an LLM response into an analysis result"""
+    result_data = extract_analysis_json(text)
+
+    # Validate with Pydantic
+    validated_result = LLMAnalysisResult.model_validate(result_data)
+
+    # Convert back to dict and map short IDs back to real IDs
+    result = remap_message_ids(validated_result.model_dump(), id_mapping)
+
+    result["conversation_id"] = conversation_id
+    return result
+
+
+def analyze_conversation_with_llm(data: dict) -> tuple[dict, str, str]:
+    """Analyze conversation using Vertex AI Gemini
+
+    Returns:
+        tuple: (result, prompt, response_text)
+    """
+    prompt, id_mapping = build_analysis_prompt(data)
+    response_text = generate_analysis_text(prompt)
+    result = parse_analysis_response(
+        response_text, id_mapping, data["conversation"]["id"])
+    return result, prompt, response_text
+
+
 def save_analysis_result(result: dict, messages: list[dict]):
     """Save analysis result to database"""
     conn = get_db_connection()
@@ -470,6 +734,281 @@ def save_analysis_result(result: dict, messages: list[dict]):
         conn.close()
 
 
+def get_last_export_watermark() -> Optional[str]:
+    """Get the watermark of the most recent completed unbounded export"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    try:
+        # Exports bounded by a date range skip conversations outside it, so
+        # they can't serve as the starting point of an incremental export
+        cursor.execute(
+            """SELECT watermark FROM export_runs
+            WHERE status = 'completed' AND watermark IS NOT NULL
+                AND from_date IS NULL AND to_date IS NULL
+            ORDER BY id DESC LIMIT 1"""
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def parse_export_bound(value: str, name: str, end: bool = False) -> tuple[str, str]:
+    """Parse a from/to date bound into an (operator, value) pair
+
+    updated_at is stored as a naive UTC ISO timestamp from the source API,
+    so bounds are normalized to the same form before string comparison:
+    offsets are converted to UTC and the separator is always "T". Date-only
+    upper bounds cover the whole day (exclusive next midnight).
+    """
+    try:
+        if len(value) == 10:
+            day = date.fromisoformat(value)
+            if end:
+                return "<", (day + timedelta(days=1)).isoformat()
+            return ">=", day.isoformat()
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid {name}: {value!r} (expected YYYY-MM-DD or ISO datetime)")
+
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return ("<=" if end else ">="), moment.isoformat()
+
+
+def build_export_filters(
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    since: Optional[str] = None,
+) -> tuple[list[str], list]:
+    """Build WHERE clauses for an export; raises ValueError on bad bounds
+
+    `since` is a UTC watermark. Conversations qualify if they were scraped
+    (new messages) or analyzed after it. scraped_at is written by the
+    backend in UTC, analyzed_at by this service in local time.
+    """
+    filters = []
+    params = []
+    if from_date:
+        op, value = parse_export_bound(from_date, "from_date")
+        filters.append(f"c.updated_at {op} ?")
+        params.append(value)
+    if to_date:
+        op, value = parse_export_bound(to_date, "to_date", end=True)
+        filters.append(f"c.updated_at {op} ?")
+        params.append(value)
+    if since:
+        since_local = datetime.fromisoformat(since).astimezone().replace(
+            tzinfo=None).isoformat()
+        filters.append(
+            """(c.scraped_at > ? OR EXISTS (
+                SELECT 1 FROM tickets t
+                WHERE t.conversation_id = c.id AND t.analyzed_at > ?))""")
+        params.extend([since, since_local])
+    return filters, params
+
+
+def iter_export_chunks(
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    since: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+):
+    """Yield lists of joined conversation records, one chunk at a time
+
+    Conversations are paged by (updated_at, id) so only `chunk_size`
+    conversations and their messages/tickets/risk flags are held in memory.
+    Each chunk is read with short statements, so no read lock is held
+    between chunks and analysis writes are not blocked.
+    """
+    if chunk_size <= 0:
+        # LIMIT 0 would "complete" an empty export, LIMIT -1 is unbounded
+        raise ValueError(
+            f"chunk_size must be a positive integer, got {chunk_size}")
+
+    filters, params = build_export_filters(from_date, to_date, since)
+
+    last_key = None
+    while True:
+        conn = get_db_connection()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        try:
+            where = list(filters)
+            where_params = list(params)
+            if last_key:
+                where.append(
+                    "(c.updated_at > ? OR (c.updated_at = ? AND c.id > ?))")
+                where_params.extend([last_key[0], last_key[0], last_key[1]])
+
+            cursor.execute(
+                f"""SELECT c.* FROM conversations c
+                {"WHERE " + " AND ".join(where) if where else ""}
+                ORDER BY c.updated_at ASC, c.id ASC
+                LIMIT ?""",
+                (*where_params, chunk_size),
+            )
+            conversations = [dict(row) for row in cursor.fetchall()]
+            if not conversations:
+                return
+
+            conv_ids = [c["id"] for c in conversations]
+            placeholders = ",".join("?" * len(conv_ids))
+            records = {
+                c["id"]: {
+                    "conversation": c,
+                    "tags": [],
+                    "tickets": [],
+                    "risk_flags": [],
+                    "messages": [],
+                }
+                for c in conversations
+            }
+
+            cursor.execute(
+                f"""SELECT ct.conversation_id, t.name FROM conversation_tags ct
+                JOIN tags t ON t.id = ct.tag_id
+                WHERE ct.conversation_id IN ({placeholders})""",
+                conv_ids,
+            )
+            for row in cursor.fetchall():
+                records[row["conversation_id"]]["tags"].append(row["name"])
+
+            cursor.execute(
+                f"""SELECT * FROM tickets
+                WHERE conversation_id IN ({placeholders})
+                ORDER BY started_at ASC""",
+                conv_ids,
+            )
+            for row in cursor.fetchall():
+                records[row["conversation_id"]]["tickets"].append(dict(row))
+
+            cursor.execute(
+                f"""SELECT m.conversation_id, rf.id, rf.message_id,
+                    rf.ticket_id, rf.risk_type
+                FROM risk_flags rf
+                JOIN messages m ON m.id = rf.message_id
+                WHERE m.conversation_id IN ({placeholders})""",
+                conv_ids,
+            )
+            for row in cursor.fetchall():
+                flag = dict(row)
+                records[flag.pop("conversation_id")]["risk_flags"].append(flag)
+
+            cursor.execute(
+                f"""SELECT id, conversation_id, sender_id, inserted_at, content,
+                    is_auto_reply, has_risk_flag
+                FROM messages
+                WHERE conversation_id IN ({placeholders})
+                ORDER BY inserted_at ASC""",
+                conv_ids,
+            )
+            for row in cursor.fetchall():
+                msg = dict(row)
+                records[msg.pop("conversation_id")]["messages"].append(msg)
+        finally:
+            conn.close()
+
+        yield [records[conv_id] for conv_id in conv_ids]
+
+        last_key = (conversations[-1]["updated_at"], conversations[-1]["id"])
+        if len(conversations) < chunk_size:
+            return
+
+
+def start_export(
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    since_last: bool = False,
+) -> dict:
+    """Validate export filters and record the run before any data is streamed
+
+    Raises ValueError for invalid filters and sqlite3.Error if the run can't
+    be recorded (e.g. export_runs is missing).
+    """
+    since = get_last_export_watermark() if since_last else None
+    build_export_filters(from_date, to_date, since)
+
+    # The export start is the next watermark: anything scraped or analyzed
+    # after it is picked up by the next incremental export
+    watermark = datetime.now(timezone.utc).isoformat(
+        timespec="milliseconds").replace("+00:00", "Z")
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            """INSERT INTO export_runs (started_at, status, from_date, to_date, since)
+            VALUES (?, 'running', ?, ?, ?)""",
+            (datetime.now().isoformat(), from_date, to_date, since),
+        )
+        run_id = cursor.lastrowid
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "id": run_id,
+        "from_date": from_date,
+        "to_date": to_date,
+        "since": since,
+        "watermark": watermark,
+    }
+
+
+def export_ndjson(run: dict, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Stream joined analysis data for a started export, one string per chunk
+
+    On completion the run's watermark is stored, and the next `since_last`
+    export resumes from it.
+    """
+    exported_count = 0
+    status = "failed"
+    error_message = None
+
+    try:
+        for chunk in iter_export_chunks(
+            run["from_date"], run["to_date"], run["since"], chunk_size
+        ):
+            exported_count += len(chunk)
+            yield "".join(
+                json.dumps(record, ensure_ascii=False) + "\n" for record in chunk
+            )
+        status = "completed"
+    except GeneratorExit:
+        # Client disconnected - don't advance the watermark
+        status = "cancelled"
+        raise
+    except Exception as e:
+        error_message = str(e)
+        raise
+    finally:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            """UPDATE export_runs SET
+                completed_at = ?,
+                status = ?,
+                watermark = ?,
+                conversations_exported = ?,
+                error_message = ?
+            WHERE id = ?""",
+            (
+                datetime.now().isoformat(),
+                status,
+                run["watermark"] if status == "completed" else None,
+                exported_count,
+                error_message,
+                run["id"],
+            ),
+        )
+        conn.commit()
+        conn.close()
+
+
 @app.get("/")
 def root():
     return {"service": "Customer Service QA LLM", "status": "running"}
@@ -477,12 +1016,41 @@ def root():
 
 @app.get("/health")
 def health():
-    """Health check endpoint"""
-    db_exists = DB_PATH.exists()
+    """Liveness check - the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+def ready(response: Response):
+    """Readiness check - the database and model client are usable"""
+    database_ready = False
+    database_error = None
+    if DB_PATH.exists():
+        try:
+            conn = get_db_connection()
+            try:
+                conn.execute("SELECT 1 FROM conversations LIMIT 1")
+                database_ready = True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            database_error = str(e)
+    else:
+        database_error = "Database file not found"
+
+    model_ready = _model is not None
+    is_ready = database_ready and model_ready
+    if not is_ready:
+        response.status_code = 503
+
     return {
-        "status": "healthy" if db_exists else "unhealthy",
+        "status": "ready" if is_ready else "not_ready",
         "database": str(DB_PATH),
-        "database_exists": db_exists,
+        "database_ready": database_ready,
+        "database_error": database_error,
+        "model": MODEL_NAME,
+        "model_ready": model_ready,
+        "model_error": _model_error,
     }
 
 
@@ -589,11 +1157,22 @@ async def analyze():
             print(f"   📨 {len(data['messages'])} messages to analyze")
 
             # Analyze with LLM
-            result = analyze_conversation_with_llm(data)
+            result, prompt, response_text = analyze_conversation_with_llm(data)
 
             # Save results
             t_created, r_created = save_analysis_result(
                 result, data["messages"])
+
+            if LLM_RECORD_DIR:
+                try:
+                    record_llm_exchange(
+                        LLM_RECORD_DIR, data, prompt, response_text, result,
+                        {"tickets_created": t_created,
+                         "risk_flags_created": r_created},
+                        MODEL_NAME)
+                except Exception as e:
+                    # Recording must never break analysis
+                    print(f"   ⚠️ Failed to record LLM exchange: {str(e)}")
             tickets_created += t_created
             risk_flags_created += r_created
             analyzed_count += 1
@@ -653,6 +1232,45 @@ async def get_conversation(conversation_id: str):
     return data
 
 
+@app.get("/conversation/{conversation_id}/messages")
+def get_conversation_messages(
+    conversation_id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = MESSAGE_PAGE_SIZE,
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """Get a page of annotated messages, answering 304 if unchanged"""
+    limit = max(1, min(limit, MAX_MESSAGE_PAGE_SIZE))
+
+    conn = get_db_connection()
+    conn.row_factory = sqlite3.Row
+    db_cursor = conn.cursor()
+
+    try:
+        # One read transaction, so the page matches the version in its ETag
+        db_cursor.execute("BEGIN")
+
+        # Cheap version check first so unchanged pages skip loading messages
+        version = get_conversation_version(db_cursor, conversation_id)
+        if version is None:
+            raise HTTPException(
+                status_code=404, detail="Conversation not found")
+
+        etag = message_page_etag(version, cursor, limit)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        page = get_conversation_messages_page(
+            db_cursor, conversation_id, version, cursor, limit)
+    finally:
+        conn.close()
+
+    response.headers.update(headers)
+    return page
+
+
 @app.get("/runs")
 async def get_runs():
     """Get analysis run history"""
@@ -722,9 +1340,62 @@ async def get_unanalyzed():
         conn.close()
 
 
+@app.get("/export")
+def export(
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    since_last: bool = False,
+):
+    """Stream conversations with tickets, risk flags and messages as NDJSON"""
+    # Set up before streaming, so failures still get a proper status code
+    try:
+        run = start_export(from_date, to_date, since_last)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except sqlite3.Error as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to start export: {str(e)}")
+
+    return StreamingResponse(
+        export_ndjson(run),
+        media_type="application/x-ndjson",
+    )
+
+
 if __name__ == "__main__":
+    import argparse
     import uvicorn
 
+    parser = argparse.ArgumentParser(description=app.title)
+    subparsers = parser.add_subparsers(dest="command")
+    export_parser = subparsers.add_parser(
+        "export", help="Export analysis data as NDJSON")
+    export_parser.add_argument("--from-date")
+    export_parser.add_argument("--to-date")
+    export_parser.add_argument(
+        "--since-last", action="store_true",
+        help="Only conversations scraped or analyzed since the last completed export")
+    export_parser.add_argument(
+        "--output", "-o", help="Output file (default: stdout)")
+    export_parser.add_argument(
+        "--chunk-size", type=positive_int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        try:
+            run = start_export(args.from_date, args.to_date, args.since_last)
+        except ValueError as e:
+            export_parser.error(str(e))
+
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for chunk in export_ndjson(run, args.chunk_size):
+                out.write(chunk)
+        finally:
+            if args.output:
+                out.close()
+        sys.exit(0)
+
     # Handle Ctrl+C gracefully on Windows
     def signal_handler(sig, frame):
         print("\n🛑 Shutting down...")
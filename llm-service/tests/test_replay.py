@@ -0,0 +1,122 @@
+"""
+Replay the committed fixture corpus through parse -> validate -> remap -> save
+Run from llm-service/: python -m unittest discover tests
+"""
+
+import copy
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import benchmark
+import main
+from llm_fixtures import Anonymizer, load_fixtures
+
+# Tables touched by save_analysis_result, mirroring backend/src/db/schema.ts
+SCHEMA_SQL = """
+CREATE TABLE conversations (
+    id TEXT PRIMARY KEY, customer_id TEXT, customer_name TEXT, snippet TEXT,
+    message_count INTEGER DEFAULT 0, inserted_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL, scraped_at TEXT NOT NULL
+);
+CREATE TABLE messages (
+    id TEXT PRIMARY KEY, conversation_id TEXT NOT NULL, content TEXT,
+    sender_id TEXT NOT NULL, inserted_at TEXT NOT NULL,
+    is_auto_reply INTEGER DEFAULT 0, has_risk_flag INTEGER DEFAULT 0
+);
+CREATE TABLE staff (id TEXT PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE tickets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, conversation_id TEXT NOT NULL,
+    staff_id TEXT, start_message_id TEXT NOT NULL, end_message_id TEXT NOT NULL,
+    sentiment TEXT, outcome TEXT, staff_attitude TEXT, staff_quality TEXT,
+    is_resolved INTEGER, started_at TEXT NOT NULL, ended_at TEXT NOT NULL,
+    analyzed_at TEXT
+);
+CREATE TABLE risk_flags (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, message_id TEXT NOT NULL,
+    ticket_id INTEGER, risk_type TEXT NOT NULL
+);
+"""
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="llm-replay-test-"))
+        schema_db = self.tmp_dir / "schema.db"
+        conn = sqlite3.connect(str(schema_db))
+        conn.executescript(SCHEMA_SQL)
+        conn.close()
+
+        self.original_db_path = main.DB_PATH
+        main.DB_PATH = benchmark.create_scratch_db(schema_db, self.tmp_dir)
+        self.fixtures = load_fixtures()
+
+    def tearDown(self):
+        main.DB_PATH = self.original_db_path
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_corpus_replays_without_diffs(self):
+        self.assertTrue(self.fixtures, "fixture corpus is empty")
+        self.assertEqual(benchmark.check_fixtures(self.fixtures, update=False), [])
+
+    def test_fixtures_with_same_ids_are_seeded_separately(self):
+        # Every recording anonymizes to conv_1, m_1, ...
+        path, fixture = self.fixtures[0]
+        twin = (path.with_name(f"twin_{path.name}"), copy.deepcopy(fixture))
+        self.assertEqual(
+            benchmark.check_fixtures([(path, fixture), twin], update=False), [])
+
+        conn = main.get_db_connection()
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(count, 2 * len(fixture["messages"]))
+
+    def test_changed_result_is_flagged(self):
+        path, fixture = copy.deepcopy(self.fixtures[0])
+        fixture["expected"]["risk_flags"] = []
+        diffs = benchmark.check_fixtures([(path, fixture)], update=False)
+        self.assertEqual(len(diffs), 1)
+
+    def test_changed_save_counts_are_flagged(self):
+        path, fixture = copy.deepcopy(self.fixtures[0])
+        fixture["expected_saved"]["tickets_created"] += 1
+        diffs = benchmark.check_fixtures([(path, fixture)], update=False)
+        self.assertEqual(len(diffs), 1)
+
+    def test_missing_save_counts_are_flagged(self):
+        path, fixture = copy.deepcopy(self.fixtures[0])
+        del fixture["expected_saved"]
+        diffs = benchmark.check_fixtures([(path, fixture)], update=False)
+        self.assertEqual(len(diffs), 1)
+
+
+class AnonymizerTest(unittest.TestCase):
+    def setUp(self):
+        self.anon = Anonymizer()
+        self.anon.add_name("Lan", "Customer")
+
+    def test_phone_numbers_with_separators(self):
+        for phone in ["0909123456", "0909 123 456", "0909.123.456",
+                      "0909-123-456", "+84 909 123 456"]:
+            self.assertEqual(self.anon.text(f"sdt {phone}"), "sdt <phone>")
+
+    def test_timestamps_are_kept(self):
+        self.assertEqual(
+            self.anon.text("2024-01-15T10:00:00"), "2024-01-15T10:00:00")
+
+    def test_names_match_whole_words(self):
+        self.assertEqual(self.anon.text("Chào Lan"), "Chào Customer")
+        self.assertEqual(self.anon.text("Lancome"), "Lancome")
+
+    def test_escaped_json_is_anonymized(self):
+        self.anon.add_name("Hà My", "Staff")
+        text = self.anon.json_text('{"staff_name": "H\\u00e0 My"}')
+        self.assertEqual(text, '{"staff_name": "Staff"}')
+
+
+if __name__ == "__main__":
+    unittest.main()